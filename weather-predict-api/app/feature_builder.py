@@ -2,11 +2,16 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from datetime import datetime
+from itertools import chain
 from pathlib import Path
 from typing import List, Tuple
 
+import numpy as np
 import pandas as pd
 
+from .utils import read_parquet
+
 # ---------------------------
 # Leak/label guards + aligner
 # ---------------------------
@@ -17,12 +22,24 @@ LEAKY_TARGET_COLS = {
     "rain_in_7d", "precip_plus7", "target", "label",
 }
 
+# Pipeline introspection is deterministic for a fitted model, so cache the
+# result per model instance instead of re-walking the Pipeline every request.
+_EXPECTED_CACHE: dict[int, list[str] | None] = {}
+
 def _expected_columns_from_pipeline(model) -> list[str] | None:
     """
     Try to extract the exact feature list the trained pipeline expects.
     Works with model.feature_names_in_ (when present) or by reading a
-    ColumnTransformer inside an sklearn Pipeline.
+    ColumnTransformer inside an sklearn Pipeline. Memoized per model.
     """
+    key = id(model)
+    if key in _EXPECTED_CACHE:
+        return _EXPECTED_CACHE[key]
+    expected = _introspect_expected_columns(model)
+    _EXPECTED_CACHE[key] = expected
+    return expected
+
+def _introspect_expected_columns(model) -> list[str] | None:
     # sklearn >= 1.0 often sets this attribute
     try:
         if hasattr(model, "feature_names_in_"):
@@ -37,14 +54,14 @@ def _expected_columns_from_pipeline(model) -> list[str] | None:
         if isinstance(model, Pipeline) and hasattr(model, "named_steps"):
             for _, step in model.named_steps.items():
                 if isinstance(step, ColumnTransformer):
-                    selected: list[str] = []
-                    for _, cols_sel, _ in step.transformers_:
-                        if cols_sel == "drop":
-                            continue
-                        if isinstance(cols_sel, (list, tuple)):
-                            selected.extend(list(cols_sel))
+                    # flatten the column selections in C; 'drop'/callable
+                    # selections fall out via the isinstance filter
+                    selected = list(chain.from_iterable(
+                        cols_sel for _, cols_sel, _ in step.transformers_
+                        if isinstance(cols_sel, (list, tuple))
+                    ))
                     if selected:
-                        # preserve order & uniqueness
+                        # preserve order & uniqueness (insertion-ordered dict)
                         return list(dict.fromkeys(selected))
     except Exception:
         pass
@@ -61,22 +78,17 @@ def align_to_model_features(X: pd.DataFrame, model) -> pd.DataFrame:
     expected = _expected_columns_from_pipeline(model)
 
     # Always drop known leak/label columns unless they are explicitly expected
-    leaks_to_drop = [
-        c for c in X.columns
-        if (c in LEAKY_TARGET_COLS) and (expected is None or c not in expected)
-    ]
-    X = X.drop(columns=leaks_to_drop, errors="ignore")
+    leaks_to_drop = X.columns.intersection(LEAKY_TARGET_COLS)
+    if expected is not None:
+        leaks_to_drop = leaks_to_drop.difference(expected)
+    X = X.drop(columns=leaks_to_drop)
 
     if expected is None:
         return X  # no strict alignment possible, but at least we removed leaks
 
-    # Add missing expected columns with 0.0
-    for c in expected:
-        if c not in X.columns:
-            X[c] = 0.0
-
-    # Reindex strictly to the expected order (ColumnTransformer requires exact match)
-    return X.reindex(columns=expected)
+    # Single reindex to the expected order, filling missing columns with 0.0
+    # (ColumnTransformer requires an exact match)
+    return X.reindex(columns=expected, fill_value=0.0)
 
 
 # ---------------------------
@@ -93,10 +105,12 @@ FEATURES_PRECIP_PARQUET = "features_precip_daily.parquet"
 # ---------------------------
 
 def _parse_date(d: str) -> pd.Timestamp:
-    ts = pd.to_datetime(d, errors="coerce")
-    if pd.isna(ts):
+    try:
+        # strptime beats pd.to_datetime on the request path; the result is
+        # already at midnight so no normalize is needed.
+        return pd.Timestamp(datetime.strptime(d, "%Y-%m-%d"))
+    except (TypeError, ValueError):
         raise ValueError(f"Invalid date string: {d}. Expected YYYY-MM-DD.")
-    return ts.normalize()
 
 def _pick_date_column(df: pd.DataFrame) -> str:
     if "date_daily" in df.columns:
@@ -110,6 +124,54 @@ def _pick_date_column(df: pd.DataFrame) -> str:
     raise ValueError("No date-like column found in features dataframe.")
 
 
+# ---------------------------
+# In-memory feature cache
+# ---------------------------
+
+class _FeatureCache:
+    """
+    Process-wide cache of a feature parquet file.
+
+    The file is read once, its date column normalized to midnight and set
+    as a sorted DatetimeIndex, and known leak/label columns dropped — so a
+    request only needs an index lookup instead of re-reading the parquet.
+    Invalidated automatically when the file's mtime changes.
+    """
+    _stores: dict[Path, "_FeatureCache"] = {}
+
+    def __init__(self, fpath: Path, df: pd.DataFrame):
+        self.fpath = fpath
+        self.mtime = fpath.stat().st_mtime
+        self.df = df                      # sorted, DatetimeIndex of normalized dates
+        self.index: pd.DatetimeIndex = df.index
+        # exact-date fast path (pad lookup below handles the rest)
+        self.positions = {ts: i for i, ts in enumerate(self.index)}
+        # sorted int64 view of the index for vectorized batch searchsorted
+        self.ordinals: np.ndarray = self.index.asi8
+
+    @classmethod
+    def get(cls, fpath: Path) -> "_FeatureCache":
+        cached = cls._stores.get(fpath)
+        if cached is not None and cached.mtime == fpath.stat().st_mtime:
+            return cached
+        df = read_parquet(fpath, use_threads=True)  # one-off bulk load
+        dcol = _pick_date_column(df)
+        # The shipped parquets are pre-normalized and sorted by
+        # scripts/prenormalize_features.py; both fix-ups below are no-ops
+        # then and only run for data that was produced some other way.
+        idx = pd.DatetimeIndex(pd.to_datetime(df[dcol]))
+        if (idx != idx.normalize()).any():
+            idx = idx.normalize()
+        drop_cols = {dcol} | LEAKY_TARGET_COLS
+        df = df.drop(columns=df.columns.intersection(drop_cols))
+        df = df.set_axis(idx)
+        if not idx.is_monotonic_increasing:
+            df = df.sort_index()
+        store = cls(fpath, df)
+        cls._stores[fpath] = store
+        return store
+
+
 # ---------------------------
 # Feature bundle
 # ---------------------------
@@ -130,66 +192,122 @@ class FeatureBuilder:
     Builds one-row feature frames for a given anchor date (no future leakage).
     - task='rain'   -> for the +7d classification
     - task='precip' -> for the 3-day cumulative precipitation regression
+
+    Pass the trained model up front (as the app does with its module-level
+    singletons) so feature alignment does not have to go back through
+    load_models() on every call.
     """
-    def __init__(self, task: str):
+    def __init__(self, task: str, model=None):
         assert task in {"rain", "precip"}, "task must be 'rain' or 'precip'"
         self.task = task
+        self.model = model
+        # Precomputed whole-table feature matrix in expected-column order
+        # (built lazily from the cache; _matrix_src tracks invalidation).
+        self._matrix: np.ndarray | None = None
+        self._expected: list[str] | None = None
+        self._matrix_src: _FeatureCache | None = None
+
+    def _resolve_model(self):
+        if self.model is not None:
+            return self.model
+        # Fallback for callers that did not supply the model up front.
+        # Local import to avoid circulars at module import time.
+        from .model_loader import load_models
+        rain_model, precip_model, _ = load_models()
+        return rain_model if self.task == "rain" else precip_model
+
+    def _features_path(self) -> Path:
+        if self.task == "rain":
+            return PROCESSED_DIR / FEATURES_RAIN_PARQUET
+        return PROCESSED_DIR / FEATURES_PRECIP_PARQUET
 
-    def _load_parquet_row_for_date(self, fpath: Path, anchor: pd.Timestamp) -> Tuple[pd.DataFrame, pd.Timestamp]:
+    def _get_cache(self) -> _FeatureCache:
+        fpath = self._features_path()
         if not fpath.exists():
             raise FileNotFoundError(
                 f"Missing features file: {fpath}. "
                 "Create it or ensure your repo contains data/processed/*.parquet."
             )
-        df = pd.read_parquet(fpath)
-        dcol = _pick_date_column(df)
-        df[dcol] = pd.to_datetime(df[dcol]).dt.normalize()
-
-        # Exact match; otherwise take the last row <= requested anchor date
-        row = df.loc[df[dcol] == anchor]
-        if row.empty:
-            row = df.loc[df[dcol] <= anchor].sort_values(dcol).tail(1)
-        if row.empty:
-            raise ValueError(f"No feature row available for {anchor.date()} in {fpath} (using column '{dcol}').")
-
-        feat_end = pd.to_datetime(row[dcol].iloc[0]).normalize()
-
-        # Drop date + common label/leak columns
-        drop_cols = {dcol} | LEAKY_TARGET_COLS
-        X = row.drop(columns=[c for c in row.columns if c in drop_cols], errors="ignore").reset_index(drop=True)
-        return X, feat_end
+        return _FeatureCache.get(fpath)
+
+    def _locate_row(self, cache: _FeatureCache, anchor: pd.Timestamp) -> int:
+        # Exact match; otherwise pad back to the last row <= requested anchor date
+        i = cache.positions.get(anchor)
+        if i is None:
+            i = cache.index.get_indexer([anchor], method="pad")[0]
+        if i < 0:
+            raise ValueError(f"No feature row available for {anchor.date()} in {cache.fpath}.")
+        return i
+
+    def _aligned_matrix(self, cache: _FeatureCache) -> Tuple[np.ndarray | None, list[str] | None]:
+        """
+        Whole-table feature matrix (float32, expected-column order), built once
+        per cache generation. A request then only slices one row out of it
+        instead of reindexing a DataFrame.
+        """
+        if self._matrix_src is cache:
+            return self._matrix, self._expected
+        try:
+            expected = _expected_columns_from_pipeline(self._resolve_model())
+        except Exception:
+            expected = None
+        M = None
+        if expected is not None:
+            M = cache.df.reindex(columns=expected, fill_value=0.0).to_numpy(dtype=np.float32)
+        self._matrix, self._expected, self._matrix_src = M, expected, cache
+        return M, expected
 
     def build_for_date(self, input_date: str) -> FeatureBundle:
         anchor = _parse_date(input_date)
-
-        if self.task == "rain":
-            fpath = PROCESSED_DIR / FEATURES_RAIN_PARQUET
-            X, feat_end = self._load_parquet_row_for_date(fpath, anchor)
-
-            # Align to the trained classification pipeline (important)
+        cache = self._get_cache()
+        i = self._locate_row(cache, anchor)
+        feat_end = cache.index[i]
+
+        M, expected = self._aligned_matrix(cache)
+        if M is not None:
+            # Fast path: one row of the prebuilt matrix, rewrapped as a 1-row
+            # DataFrame because the ColumnTransformer selects columns by name.
+            X = pd.DataFrame(M[i:i + 1], columns=expected)
+        else:
+            # Fallback: align the cached frame's row directly (leaks already
+            # dropped at cache load; CoW means no defensive copy is needed).
+            X = cache.df.iloc[[i]].reset_index(drop=True)
             try:
-                # Local import to avoid circulars at module import time
-                from .model_loader import load_models
-                _RAIN_MODEL, _, _ = load_models()
-                X = align_to_model_features(X.copy(), _RAIN_MODEL)
+                X = align_to_model_features(X, self._resolve_model())
+                X = X.astype(np.float32, copy=False)
             except Exception:
-                # If anything fails, still return X (we already dropped leaks)
                 pass
 
-            return FeatureBundle(X=X, feature_names=list(X.columns), feature_end_date=feat_end)
-
-        else:  # self.task == "precip"
-            fpath = PROCESSED_DIR / FEATURES_PRECIP_PARQUET
-            X, feat_end = self._load_parquet_row_for_date(fpath, anchor)
-
-            # Keep it clean for regression too
-            X = X.drop(columns=[c for c in X.columns if c in LEAKY_TARGET_COLS], errors="ignore")
-
+        return FeatureBundle(X=X, feature_names=list(X.columns), feature_end_date=feat_end)
+
+    def build_for_dates(self, input_dates: List[str]) -> Tuple[pd.DataFrame, pd.DatetimeIndex]:
+        """
+        Batch variant of build_for_date: one stacked feature frame (one row per
+        requested date, in request order) plus the feature-end date of each row.
+        The whole batch is resolved with a single vectorized pad lookup and one
+        slice of the prebuilt matrix.
+        """
+        anchors = pd.DatetimeIndex([_parse_date(d) for d in input_dates])
+        cache = self._get_cache()
+
+        # Vectorized binary search over the precomputed int64 dates: last row
+        # with date <= anchor (same semantics as the single-date pad lookup).
+        # Match the index resolution first so the int64 views are comparable.
+        anchor_i8 = anchors.as_unit(cache.index.unit).asi8
+        idx = np.searchsorted(cache.ordinals, anchor_i8, side="right") - 1
+        if (idx < 0).any():
+            bad = anchors[idx < 0][0]
+            raise ValueError(f"No feature row available for {bad.date()} in {cache.fpath}.")
+        feat_ends = cache.index[idx]
+
+        M, expected = self._aligned_matrix(cache)
+        if M is not None:
+            X = pd.DataFrame(M[idx], columns=expected)
+        else:
+            X = cache.df.iloc[idx].reset_index(drop=True)
             try:
-                from .model_loader import load_models
-                _, _PREC_MODEL, _ = load_models()
-                X = align_to_model_features(X.copy(), _PREC_MODEL)
+                X = align_to_model_features(X, self._resolve_model())
+                X = X.astype(np.float32, copy=False)
             except Exception:
                 pass
-
-            return FeatureBundle(X=X, feature_names=list(X.columns), feature_end_date=feat_end)
\ No newline at end of file
+        return X, feat_ends
\ No newline at end of file
@@ -1,20 +1,31 @@
 # app/main.py
 from fastapi import FastAPI, Query, HTTPException
-from datetime import date as date_type
-from typing import Dict, Any
+from fastapi.responses import ORJSONResponse
+from datetime import datetime, date as date_type
+from typing import Dict, Any, List
 import logging
-import math
 from pathlib import Path
 
+from scipy.special import expit
+
 import pandas as pd
 
+# pandas >= 3.0 always runs with copy-on-write; opt in explicitly on 2.x so
+# feature alignment can skip its defensive copies.
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
 from .schemas import (
     HealthResponse,
-    RainResponse, RainPrediction,
+    RainResponse, RainPrediction, RainBatchRequest,
     PrecipResponse, PrecipPrediction,
 )
 from .model_loader import load_models
 from .feature_builder import FeatureBuilder
+from .utils import read_parquet
 
 # ---------------- Logging ----------------
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
@@ -31,14 +42,23 @@ app = FastAPI(
         " - GET /               -> About & usage\n"
         " - GET /health/        -> 200 OK\n"
         " - GET /predict/rain/  -> ?date=YYYY-MM-DD\n"
+        " - POST /predict/rain/batch/ -> {\"dates\": [\"YYYY-MM-DD\", ...]}\n"
         " - GET /predict/precipitation/fall/ -> ?date=YYYY-MM-DD\n"
     ),
     version="1.0.0",
+    # orjson marshals the response bodies several times faster than the
+    # stdlib encoder; the Pydantic models stay in place as validators.
+    default_response_class=ORJSONResponse,
 )
 
 # ---------------- Load models once ----------------
 RAIN_MODEL, PREC_MODEL, RAIN_THRESHOLD = load_models()
 
+# One builder per task, constructed once with its model so per-request calls
+# skip model re-resolution entirely.
+RAIN_FB = FeatureBuilder("rain", model=RAIN_MODEL)
+PRECIP_FB = FeatureBuilder("precip", model=PREC_MODEL)
+
 # ---------------- Dataset coverage (min/max supported date) ----------------
 RAIN_FEATS = Path("data/processed/features_rain_daily.parquet")
 PREC_FEATS = Path("data/processed/features_precip_daily.parquet")
@@ -46,11 +66,14 @@ PREC_FEATS = Path("data/processed/features_precip_daily.parquet")
 def _date_range_from_parquet(p: Path) -> tuple[pd.Timestamp, pd.Timestamp]:
     if not p.exists():
         raise RuntimeError(f"Required feature file missing: {p}")
-    df = pd.read_parquet(p, columns=None)
-    for c in df.columns:
+    # Probe the schema for the date column first, then read only that column
+    # so pyarrow skips decoding the rest of the (wide) feature table.
+    schema = pq.ParquetFile(p).schema_arrow
+    for c, t in zip(schema.names, schema.types):
         cl = str(c).lower()
-        if cl in {"date", "date_daily"} or pd.api.types.is_datetime64_any_dtype(df[c]):
-            d = pd.to_datetime(df[c]).dt.tz_localize(None).dt.normalize()
+        if cl in {"date", "date_daily"} or pa.types.is_timestamp(t) or pa.types.is_date(t):
+            d = pd.to_datetime(read_parquet(p, columns=[c], use_threads=False)[c])
+            d = d.dt.tz_localize(None).dt.normalize()
             return d.min(), d.max()
     raise RuntimeError(f"No date-like column in {p}")
 
@@ -68,10 +91,12 @@ except Exception as e:
 def _parse_date_str(d: str) -> pd.Timestamp:
     """Parse 'YYYY-MM-DD' into a normalized Timestamp (HTTP 400 if invalid)."""
     try:
-        ts = pd.to_datetime(d, format="%Y-%m-%d", errors="raise")
-    except Exception:
+        # strptime is much cheaper than pd.to_datetime dispatch, and the
+        # result is midnight/naive by construction — no normalize needed.
+        dt = datetime.strptime(d, "%Y-%m-%d")
+    except (TypeError, ValueError):
         raise HTTPException(status_code=400, detail="Invalid date format. Expected 'YYYY-MM-DD'.")
-    return ts.tz_localize(None).normalize()
+    return pd.Timestamp(dt)
 
 def _validate_not_before_min(d0: pd.Timestamp):
     """
@@ -116,6 +141,7 @@ def home() -> Dict[str, Any]:
             "/": "this message",
             "/health/": "GET – service status",
             "/predict/rain/": "GET – ?date=YYYY-MM-DD (rain-or-not for date+7)",
+            "/predict/rain/batch/": "POST – {'dates': [...]} (one prediction per date)",
             "/predict/precipitation/fall/": "GET – ?date=YYYY-MM-DD (3-day cumulative precipitation)",
         },
         "notes": (
@@ -138,15 +164,15 @@ def predict_rain(date: str = Query(..., description="YYYY-MM-DD")) -> RainRespon
     d0 = _parse_date_str(date)
     _validate_not_before_min(d0)
 
-    fb = FeatureBuilder("rain").build_for_date(date)
+    fb = RAIN_FB.build_for_date(date)
     target_date = d0 + pd.Timedelta(days=7)
     _no_future_leakage(fb.feature_end_date, target_date)
 
     if hasattr(RAIN_MODEL, "predict_proba"):
         proba = float(RAIN_MODEL.predict_proba(fb.X)[:, 1][0])
     elif hasattr(RAIN_MODEL, "decision_function"):
-        score = float(RAIN_MODEL.decision_function(fb.X)[0])
-        proba = 1.0 / (1.0 + math.exp(-score))
+        # expit is C-level and does not overflow for large |score|
+        proba = float(expit(RAIN_MODEL.decision_function(fb.X)[0]))
     else:
         proba = float(RAIN_MODEL.predict(fb.X)[0])
 
@@ -158,12 +184,49 @@ def predict_rain(date: str = Query(..., description="YYYY-MM-DD")) -> RainRespon
         prediction=RainPrediction(date=target_date.date(), will_rain=will_rain),
     )
 
+@app.post("/predict/rain/batch/", response_model=List[RainResponse])
+def predict_rain_batch(payload: RainBatchRequest) -> List[RainResponse]:
+    """
+    Batched rain predictions: sklearn's per-call overhead is paid once for the
+    whole stacked matrix instead of once per date.
+    """
+    if not payload.dates:
+        return []
+
+    d0s = [_parse_date_str(d) for d in payload.dates]
+    for d0 in d0s:
+        _validate_not_before_min(d0)
+
+    X, feat_ends = RAIN_FB.build_for_dates(payload.dates)
+    target_dates = [d0 + pd.Timedelta(days=7) for d0 in d0s]
+    for feat_end, target_date in zip(feat_ends, target_dates):
+        _no_future_leakage(feat_end, target_date)
+
+    if hasattr(RAIN_MODEL, "predict_proba"):
+        probas = RAIN_MODEL.predict_proba(X)[:, 1]
+    elif hasattr(RAIN_MODEL, "decision_function"):
+        probas = expit(RAIN_MODEL.decision_function(X))
+    else:
+        probas = RAIN_MODEL.predict(X)
+
+    log.info("RAIN batch n=%d", len(d0s))
+    return [
+        RainResponse(
+            input_date=d0.date(),
+            prediction=RainPrediction(
+                date=target_date.date(),
+                will_rain=bool(proba >= RAIN_THRESHOLD),
+            ),
+        )
+        for d0, target_date, proba in zip(d0s, target_dates, probas)
+    ]
+
 @app.get("/predict/precipitation/fall/", response_model=PrecipResponse)
 def predict_precipitation(date: str = Query(..., description="YYYY-MM-DD")) -> PrecipResponse:
     d0 = _parse_date_str(date)
     _validate_not_before_min(d0)
 
-    fb = FeatureBuilder("precip").build_for_date(date)
+    fb = PRECIP_FB.build_for_date(date)
     start_date = d0 + pd.Timedelta(days=1)
     end_date   = d0 + pd.Timedelta(days=3)
     _no_future_leakage(fb.feature_end_date, start_date)
@@ -12,14 +12,25 @@ RAIN_MODEL_PATH  = RAIN_DIR / "best_model.joblib"
 PREC_MODEL_PATH  = PREC_DIR / "best_model.joblib"
 RAIN_THRESH_PATH = RAIN_DIR / "threshold.json"
 
+# Memoized result of load_models(); deserializing the pickles is far too
+# expensive to repeat, and every caller wants the same three objects.
+_cached: Optional[Tuple[object, object, float]] = None
+
 def load_models() -> Tuple[object, object, float]:
+    global _cached
+    if _cached is not None:
+        return _cached
+
     if not RAIN_MODEL_PATH.exists():
         raise FileNotFoundError(f"Rain model not found: {RAIN_MODEL_PATH}")
     if not PREC_MODEL_PATH.exists():
         raise FileNotFoundError(f"Precip model not found: {PREC_MODEL_PATH}")
 
-    rain_model = load(RAIN_MODEL_PATH)
-    precip_model = load(PREC_MODEL_PATH)
+    # mmap the numpy buffers inside the pickles instead of copying them onto
+    # the heap: smaller RSS and faster cold-start. Requires the models to be
+    # dumped uncompressed (joblib.dump(..., compress=0)), which ours are.
+    rain_model = load(RAIN_MODEL_PATH, mmap_mode="r")
+    precip_model = load(PREC_MODEL_PATH, mmap_mode="r")
 
     # optional threshold
     threshold = 0.5
@@ -31,4 +42,5 @@ def load_models() -> Tuple[object, object, float]:
         except Exception:
             pass
 
-    return rain_model, precip_model, float(threshold)
+    _cached = (rain_model, precip_model, float(threshold))
+    return _cached
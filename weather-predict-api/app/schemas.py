@@ -1,7 +1,7 @@
 # app/schemas.py
 from pydantic import BaseModel
 from datetime import date
-from typing import Literal
+from typing import List, Literal
 
 class HealthResponse(BaseModel):
     status: Literal["ok"]
@@ -15,6 +15,9 @@ class RainResponse(BaseModel):
     input_date: date
     prediction: RainPrediction
 
+class RainBatchRequest(BaseModel):
+    dates: List[str]      # each "YYYY-MM-DD"
+
 # ---- Precipitation (regression) ----
 class PrecipPrediction(BaseModel):
     start_date: date      # input_date + 1
@@ -1,23 +1,20 @@
 # app/utils.py
 from datetime import date, timedelta
 
-def plus_days(d: date, n: int) -> date:
-    """Return a new date that is n days after d."""
-    return d + timedelta(days=n)
+import pandas as pd
 
 
-def align_to_model_columns(df, model):
+def read_parquet(p, columns=None, use_threads=True) -> pd.DataFrame:
     """
-    Ensure df has the same columns (and order) the model was trained with.
-    Missing columns are added with 0. Extra columns are dropped.
+    pd.read_parquet with the engine and threading made explicit.
+
+    Bulk loads (e.g. warming the feature cache at startup) want Arrow's
+    thread pool; small probes like a single-column read should not spin
+    up threads at all.
     """
-    expected = getattr(model, "feature_names_in_", None)
-    if expected is None:  # model wasn't fit with column names
-        return df
-    X = df.copy()
-    for col in expected:
-        if col not in X.columns:
-            X[col] = 0
-    # reorder and drop extras
-    X = X.loc[:, list(expected)]
-    return X
\ No newline at end of file
+    return pd.read_parquet(p, engine="pyarrow", columns=columns, use_threads=use_threads)
+
+
+def plus_days(d: date, n: int) -> date:
+    """Return a new date that is n days after d."""
+    return d + timedelta(days=n)
\ No newline at end of file
@@ -0,0 +1,46 @@
+# scripts/prenormalize_features.py
+"""
+One-time preprocessing for the feature parquets.
+
+Rewrites data/processed/features_*_daily.parquet so the date column is
+already datetime64[ns] normalized to midnight and the rows are sorted by
+date, in a single row group. The API's feature cache can then index the
+data as-is instead of normalizing and sorting at load time.
+
+Run from the repo root:  python scripts/prenormalize_features.py
+"""
+from pathlib import Path
+
+import pandas as pd
+
+PROCESSED_DIR = Path("data/processed")
+FEATURE_FILES = [
+    PROCESSED_DIR / "features_rain_daily.parquet",
+    PROCESSED_DIR / "features_precip_daily.parquet",
+]
+
+
+def _pick_date_column(df: pd.DataFrame) -> str:
+    if "date_daily" in df.columns:
+        return "date_daily"
+    if "date" in df.columns:
+        return "date"
+    for c in df.columns:
+        if pd.api.types.is_datetime64_any_dtype(df[c]):
+            return c
+    raise ValueError("No date-like column found in features dataframe.")
+
+
+def prenormalize(fpath: Path) -> None:
+    df = pd.read_parquet(fpath)
+    dcol = _pick_date_column(df)
+    df[dcol] = pd.to_datetime(df[dcol]).dt.normalize()
+    df = df.sort_values(dcol).reset_index(drop=True)
+    # One row group: the API always loads the whole file anyway.
+    df.to_parquet(fpath, index=False, row_group_size=len(df))
+    print(f"rewrote {fpath}: {len(df)} rows, dates {df[dcol].min().date()} -> {df[dcol].max().date()}")
+
+
+if __name__ == "__main__":
+    for f in FEATURE_FILES:
+        prenormalize(f)
@@ -8,3 +8,10 @@ def test_root_ok():
 def test_predict_rain_bad_date():
     r = client.get("/predict/rain/", params={"date": "bad"})
     assert r.status_code in (400, 422)
+
+def test_predict_rain_batch():
+    r = client.post("/predict/rain/batch/", json={"dates": ["2020-06-15", "2020-06-16"]})
+    assert r.status_code == 200
+    body = r.json()
+    assert len(body) == 2
+    assert body[0]["prediction"]["date"] == "2020-06-22"